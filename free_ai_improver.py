@@ -4,124 +4,37 @@ Free AI Prompt Improver
 Uses free Hugging Face models (no API key required) to improve prompts.
 """
 
-import argparse
+import functools
+import os
+import re
 import sys
 
 
-def improve_prompt_with_free_ai(prompt):
-    """Use free Hugging Face models to improve prompts."""
-    
-    # Try to use Hugging Face transformers
-    try:
-        from transformers import pipeline, set_seed
-        
-        print("🤖 Loading free AI model (this may take a moment)...")
-        
-        # Use a free text generation model
-        # We'll use a smaller model that works without API keys
-        generator = pipeline(
-            'text-generation',
-            model='microsoft/DialoGPT-medium',
-            tokenizer='microsoft/DialoGPT-medium',
-            device=-1  # Use CPU (works on all machines)
-        )
-        
-        # Create improvement prompt
-        improvement_request = f"""Improve this prompt to make it more effective:
-
-Original: "{prompt}"
-
-Better version:"""
-        
-        # Generate improved prompt
-        set_seed(42)  # For consistent results
-        result = generator(
-            improvement_request,
-            max_length=200,
-            num_return_sequences=1,
-            temperature=0.7,
-            do_sample=True,
-            pad_token_id=generator.tokenizer.eos_token_id
-        )
-        
-        # Extract the improved prompt
-        generated_text = result[0]['generated_text']
-        improved_prompt = generated_text.split("Better version:")[-1].strip()
-        
-        # Clean up the result
-        if improved_prompt:
-            return {
-                'original_prompt': prompt,
-                'improved_prompt': improved_prompt,
-                'method': 'Free AI (Hugging Face)',
-                'success': True
-            }
-        else:
-            raise Exception("No improvement generated")
-            
-    except ImportError:
-        print("⚠️ Transformers not installed. Using rule-based improvement.")
-        return improve_prompt_manually(prompt)
-    except Exception as e:
-        print(f"⚠️ AI model error: {e}. Using rule-based improvement.")
-        return improve_prompt_manually(prompt)
-
-
-def improve_prompt_manually(prompt):
-    """Fallback: Improve prompt using smart rules."""
-    
-    # Detect prompt type
-    prompt_type = detect_prompt_type(prompt)
-    
-    # Apply type-specific improvements
-    improvements = {
-        'coding': improve_coding_prompt,
-        'math': improve_math_prompt,
-        'analysis': improve_analysis_prompt,
-        'creative': improve_creative_prompt,
-        'explanation': improve_explanation_prompt,
-        'decision': improve_decision_prompt
-    }
-    
-    improver = improvements.get(prompt_type, improve_general_prompt)
-    improved = improver(prompt)
-    
-    return {
-        'original_prompt': prompt,
-        'improved_prompt': improved,
-        'method': 'Smart Rules',
-        'success': True
-    }
-
-
-def detect_prompt_type(prompt):
-    """Detect what type of prompt this is."""
-    prompt_lower = prompt.lower()
-    
-    if any(word in prompt_lower for word in ['function', 'code', 'program', 'algorithm', 'write', 'implement']):
-        return 'coding'
-    elif any(word in prompt_lower for word in ['calculate', 'solve', 'math', 'equation', 'formula']):
-        return 'math'
-    elif any(word in prompt_lower for word in ['analyze', 'compare', 'evaluate', 'study', 'examine']):
-        return 'analysis'
-    elif any(word in prompt_lower for word in ['create', 'design', 'story', 'poem', 'creative', 'write']):
-        return 'creative'
-    elif any(word in prompt_lower for word in ['explain', 'describe', 'what is', 'how does', 'tell me']):
-        return 'explanation'
-    elif any(word in prompt_lower for word in ['should', 'recommend', 'choose', 'decide', 'better']):
-        return 'decision'
-    else:
-        return 'general'
-
-
-def improve_coding_prompt(prompt):
-    """Improve coding prompts with specific requirements."""
-    if 'python' not in prompt.lower():
-        base = f"Write a Python {prompt.lower()}"
-    else:
-        base = prompt
-    
-    return f"""{base}
+# Keywords for each prompt type, checked in priority order (first match wins)
+PROMPT_TYPE_KEYWORDS = (
+    ('coding', ('function', 'code', 'program', 'algorithm', 'write', 'implement')),
+    ('math', ('calculate', 'solve', 'math', 'equation', 'formula')),
+    ('analysis', ('analyze', 'compare', 'evaluate', 'study', 'examine')),
+    ('creative', ('create', 'design', 'story', 'poem', 'creative', 'write')),
+    ('explanation', ('explain', 'describe', 'what is', 'how does', 'tell me')),
+    ('decision', ('should', 'recommend', 'choose', 'decide', 'better')),
+)
+
+# All keywords in one regex, one named group per prompt type, so a prompt is
+# scanned once. Matches are anchored at word starts so that e.g. 'decode'
+# doesn't count as 'code' while 'functions' still counts as 'function'. The
+# lookahead keeps matches zero-width, so every word start gets checked.
+PROMPT_TYPE_PATTERN = re.compile(r'\b(?=' + '|'.join(
+    f"(?P<{prompt_type}>{'|'.join(map(re.escape, keywords))})"
+    for prompt_type, keywords in PROMPT_TYPE_KEYWORDS
+) + ')')
+PROMPT_TYPE_PRIORITY = {
+    prompt_type: priority
+    for priority, (prompt_type, _) in enumerate(PROMPT_TYPE_KEYWORDS)
+}
+
+# Static text appended to each prompt type by the rule-based improvers
+CODING_SUFFIX = """
 
 Requirements:
 • Include proper type hints and docstring with examples
@@ -133,10 +46,7 @@ Requirements:
 
 Provide clean, production-ready code."""
 
-
-def improve_math_prompt(prompt):
-    """Improve math prompts with step-by-step requirements."""
-    return f"""{prompt}
+MATH_SUFFIX = """
 
 Please:
 • Show all calculation steps clearly
@@ -146,10 +56,7 @@ Please:
 • Include units where applicable
 • Provide a real-world context if helpful"""
 
-
-def improve_analysis_prompt(prompt):
-    """Improve analysis prompts with structure."""
-    return f"""{prompt}
+ANALYSIS_SUFFIX = """
 
 Structure your analysis with:
 • Clear introduction and context
@@ -161,10 +68,7 @@ Structure your analysis with:
 
 Use clear headings and logical flow."""
 
-
-def improve_creative_prompt(prompt):
-    """Improve creative prompts."""
-    return f"""{prompt}
+CREATIVE_SUFFIX = """
 
 Creative requirements:
 • Be original and engaging
@@ -174,10 +78,7 @@ Creative requirements:
 • Use appropriate tone and style
 • Show creativity while staying on topic"""
 
-
-def improve_explanation_prompt(prompt):
-    """Improve explanation prompts."""
-    return f"""{prompt}
+EXPLANATION_SUFFIX = """
 
 Please provide:
 • A clear, easy-to-understand explanation
@@ -189,10 +90,7 @@ Please provide:
 
 Tailor the explanation for a general audience."""
 
-
-def improve_decision_prompt(prompt):
-    """Improve decision-making prompts."""
-    return f"""{prompt}
+DECISION_SUFFIX = """
 
 Please consider:
 • All available options and alternatives
@@ -204,10 +102,7 @@ Please consider:
 
 Provide a structured decision framework."""
 
-
-def improve_general_prompt(prompt):
-    """Improve general prompts."""
-    return f"""{prompt}
+GENERAL_SUFFIX = """
 
 Please provide:
 • A comprehensive and well-structured response
@@ -218,123 +113,486 @@ Please provide:
 • Summary of key points"""
 
 
-def show_examples():
-    """Show before/after improvement examples."""
-    examples = [
-        {
-            'type': 'Coding',
-            'original': 'Write a sorting function',
-            'improved': '''Write a Python sorting function
+# (type, original, improved) triples shown by --examples
+EXAMPLES = (
+    ('CODING', 'Write a sorting function', 'Write a Python sorting function' + CODING_SUFFIX),
+    ('MATH', 'Calculate 15% tip', 'Calculate 15% tip' + MATH_SUFFIX),
+    ('ANALYSIS', 'Compare iPhone vs Android', 'Compare iPhone vs Android' + ANALYSIS_SUFFIX),
+)
 
-Requirements:
-• Include proper type hints and docstring with examples
-• Handle edge cases and potential errors
-• Follow PEP 8 style guidelines and best practices
-• Add clear comments explaining the logic
-• Include example usage and test cases
-• Consider time and space complexity
+# Shown when the CLI is run without a prompt
+USAGE = """FREE AI PROMPT IMPROVER
+========================================
+No API key required! Uses free AI models.
 
-Provide clean, production-ready code.'''
-        },
-        {
-            'type': 'Math',
-            'original': 'Calculate 15% tip',
-            'improved': '''Calculate 15% tip
+Usage: python free_ai_improver.py "Your prompt here"
+       python free_ai_improver.py --examples
+       python free_ai_improver.py --batch prompts.txt
 
-Please:
-• Show all calculation steps clearly
-• Explain the reasoning behind each step
-• Use proper mathematical notation
-• Verify the final answer
-• Include units where applicable
-• Provide a real-world context if helpful'''
-        },
-        {
-            'type': 'Analysis',
-            'original': 'Compare iPhone vs Android',
-            'improved': '''Compare iPhone vs Android
+📦 Install transformers for AI mode: pip install transformers torch
+"""
+
+# Summary lines shown by --compare after the word counts
+IMPROVEMENT_NOTES = (
+    "• Added specific requirements and structure",
+    "• Improved clarity and completeness",
+    "• Enhanced with best practices",
+)
+
+# Small instruction-tuned model: follows the rewrite request and loads fast
+MODEL_NAME = 'google/flan-t5-small'
+# Greedy decoding: deterministic and cheaper to run
+GENERATION_KWARGS = {
+    'max_new_tokens': 80,
+    'do_sample': False,
+    'num_beams': 1,
+}
+
+# Prompts generated together per forward pass in --batch mode
+DEFAULT_BATCH_SIZE = 8
+
+# Generated prompts are cached on disk so repeated runs skip the model
+CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'free_ai_improver', 'responses.sqlite'
+)
+
+
+@functools.lru_cache(maxsize=1)
+def get_generator():
+    """Load the free text generation model once and reuse it (tokenizer, model)."""
+    # Imported here so rule-based runs never pay for transformers
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+    import torch
+    
+    print("🤖 Loading free AI model (this may take a moment)...")
+    
+    # Use the GPU when there is one, otherwise the CPU (works on all machines).
+    # Only bf16-capable GPUs get half precision: T5 overflows in fp16.
+    use_gpu = torch.cuda.is_available()
+    use_bf16 = use_gpu and torch.cuda.is_bf16_supported()
+    
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+    model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
+    # Cast after loading, which works the same on every transformers version
+    # (the from_pretrained dtype argument was renamed in 5.x)
+    model.to(
+        device='cuda' if use_gpu else 'cpu',
+        dtype=torch.bfloat16 if use_bf16 else torch.float32
+    )
+    model.eval()
+    return tokenizer, model
+
+
+def generate_improvements(requests, batch_size=DEFAULT_BATCH_SIZE):
+    """Run the model over the requests in batches and return the decoded texts."""
+    tokenizer, model = get_generator()
+    
+    texts = []
+    for start in range(0, len(requests), batch_size):
+        inputs = tokenizer(
+            requests[start:start + batch_size], return_tensors='pt', padding=True
+        ).to(model.device)
+        output_ids = model.generate(
+            input_ids=inputs['input_ids'],
+            attention_mask=inputs['attention_mask'],
+            **GENERATION_KWARGS
+        )
+        texts.extend(tokenizer.batch_decode(output_ids, skip_special_tokens=True))
+    return texts
+
+
+@functools.lru_cache(maxsize=1)
+def get_cache():
+    """Open the response cache, or return None if it can't be used."""
+    # Imported here (and below) so --manual/--examples runs, and machines
+    # without transformers or torch, never pay for sqlite3
+    import sqlite3
+    
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        conn = sqlite3.connect(CACHE_PATH)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, improved TEXT)"
+        )
+        return conn
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def cache_key(prompt):
+    """Build a cache key from the model input, model and generation settings."""
+    import hashlib
+    
+    # Hash the full request so rewording the instruction invalidates entries
+    settings = sorted(GENERATION_KWARGS.items())
+    raw = f"{build_improvement_request(prompt)}|{MODEL_NAME}|{settings}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def get_cached_response(prompt):
+    """Return a previously generated improvement, or None."""
+    import sqlite3
+    
+    conn = get_cache()
+    if conn is None:
+        return None
+    try:
+        row = conn.execute(
+            "SELECT improved FROM responses WHERE key = ?", (cache_key(prompt),)
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+
+def store_cached_response(prompt, improved_prompt):
+    """Save a generated improvement for later runs."""
+    import sqlite3
+    
+    conn = get_cache()
+    if conn is None:
+        return
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, improved) VALUES (?, ?)",
+                (cache_key(prompt), improved_prompt)
+            )
+    except sqlite3.Error:
+        pass
+
+
+def ai_packages_installed():
+    """Check whether transformers and torch can be imported, without importing them."""
+    import importlib.util
+    
+    return all(
+        importlib.util.find_spec(package) is not None
+        for package in ('transformers', 'torch')
+    )
+
+
+def build_improvement_request(prompt):
+    """Wrap a prompt in the instruction sent to the AI model."""
+    return f"Rewrite this prompt to be more specific and structured:\n\n{prompt}"
 
-Structure your analysis with:
-• Clear introduction and context
-• Key findings with supporting evidence
-• Multiple perspectives where relevant
-• Specific examples and data points
-• Actionable insights and recommendations
-• Well-organized conclusion
 
-Use clear headings and logical flow.'''
-        }
+def improve_prompt_with_free_ai(prompt, use_cache=True):
+    """Use free Hugging Face models to improve prompts."""
+    return improve_prompts_with_free_ai([prompt], use_cache=use_cache)[0]
+
+
+def improve_prompts_with_free_ai(prompts, use_cache=True, batch_size=DEFAULT_BATCH_SIZE):
+    """Improve several prompts with one model load and batched generation."""
+    results = [None] * len(prompts)
+    
+    # Prompts still to generate, each mapped to every position it appears at
+    pending = {}
+    
+    # Without transformers and torch nothing can be generated or served from
+    # the cache, so don't open (or create) it for the rule-based fallback
+    if use_cache and not ai_packages_installed():
+        use_cache = False
+    
+    # Reuse earlier generations for the same prompt and settings
+    for i, prompt in enumerate(prompts):
+        if prompt in pending:
+            pending[prompt].append(i)
+            continue
+        improved_prompt = get_cached_response(prompt) if use_cache else None
+        if improved_prompt:
+            results[i] = {
+                'original_prompt': prompt,
+                'improved_prompt': improved_prompt,
+                'method': 'Free AI (Hugging Face, cached)',
+                'success': True
+            }
+        else:
+            pending[prompt] = [i]
+    
+    if not pending:
+        return results
+    
+    # Try to use Hugging Face transformers
+    try:
+        # Generate each distinct remaining prompt once, in batches
+        outputs = generate_improvements(
+            [build_improvement_request(prompt) for prompt in pending],
+            batch_size=batch_size
+        )
+        
+        # Seq2seq models return only the rewritten prompt
+        improved_prompts = [text.strip() for text in outputs]
+        if len(improved_prompts) != len(pending):
+            raise Exception("Unexpected number of generated prompts")
+    except ImportError as e:
+        package = (e.name or 'transformers').split('.')[0]
+        print(f"⚠️ {package.capitalize()} not installed. Using rule-based improvement.")
+        improved_prompts = None
+    except Exception as e:
+        print(f"⚠️ AI model error: {e}. Using rule-based improvement.")
+        improved_prompts = None
+    
+    if improved_prompts is None:
+        for prompt, indices in pending.items():
+            for i in indices:
+                results[i] = improve_prompt_manually(prompt)
+        return results
+    
+    for (prompt, indices), improved_prompt in zip(pending.items(), improved_prompts):
+        if not improved_prompt:
+            print("⚠️ AI model error: No improvement generated. Using rule-based improvement.")
+            for i in indices:
+                results[i] = improve_prompt_manually(prompt)
+            continue
+        
+        if use_cache:
+            store_cached_response(prompt, improved_prompt)
+        for i in indices:
+            results[i] = {
+                'original_prompt': prompt,
+                'improved_prompt': improved_prompt,
+                'method': 'Free AI (Hugging Face)',
+                'success': True
+            }
+    
+    return results
+
+
+def improve_prompt_manually(prompt):
+    """Fallback: Improve prompt using smart rules."""
+    return {
+        'original_prompt': prompt,
+        'improved_prompt': rule_based_improvement(prompt),
+        'method': 'Smart Rules',
+        'success': True
+    }
+
+
+@functools.lru_cache(maxsize=1024)
+def rule_based_improvement(prompt):
+    """Return the smart-rules version of a prompt (memoized; rules are deterministic)."""
+    
+    # Lowercase once; detection and the improvers share the copy
+    prompt_lower = prompt.lower()
+    
+    # Detect prompt type
+    prompt_type = detect_prompt_type(prompt, prompt_lower)
+    
+    # Apply type-specific improvements
+    improver = PROMPT_IMPROVERS.get(prompt_type, improve_general_prompt)
+    return improver(prompt, prompt_lower)
+
+
+def detect_prompt_type(prompt, prompt_lower=None):
+    """Detect what type of prompt this is."""
+    if prompt_lower is None:
+        prompt_lower = prompt.lower()
+    
+    # Keep the highest-priority type seen; stop early at the top one
+    best_type = 'general'
+    best_priority = len(PROMPT_TYPE_KEYWORDS)
+    for match in PROMPT_TYPE_PATTERN.finditer(prompt_lower):
+        priority = PROMPT_TYPE_PRIORITY[match.lastgroup]
+        if priority < best_priority:
+            best_type, best_priority = match.lastgroup, priority
+            if priority == 0:
+                break
+    return best_type
+
+
+def improve_coding_prompt(prompt, prompt_lower=None):
+    """Improve coding prompts with specific requirements."""
+    if prompt_lower is None:
+        prompt_lower = prompt.lower()
+    if 'python' not in prompt_lower:
+        base = "Write a Python " + prompt_lower
+    else:
+        base = prompt
+    
+    return base + CODING_SUFFIX
+
+
+def improve_math_prompt(prompt, prompt_lower=None):
+    """Improve math prompts with step-by-step requirements."""
+    return prompt + MATH_SUFFIX
+
+
+def improve_analysis_prompt(prompt, prompt_lower=None):
+    """Improve analysis prompts with structure."""
+    return prompt + ANALYSIS_SUFFIX
+
+
+def improve_creative_prompt(prompt, prompt_lower=None):
+    """Improve creative prompts."""
+    return prompt + CREATIVE_SUFFIX
+
+
+def improve_explanation_prompt(prompt, prompt_lower=None):
+    """Improve explanation prompts."""
+    return prompt + EXPLANATION_SUFFIX
+
+
+def improve_decision_prompt(prompt, prompt_lower=None):
+    """Improve decision-making prompts."""
+    return prompt + DECISION_SUFFIX
+
+
+def improve_general_prompt(prompt, prompt_lower=None):
+    """Improve general prompts."""
+    return prompt + GENERAL_SUFFIX
+
+
+# Type-specific improvers; anything else gets improve_general_prompt
+PROMPT_IMPROVERS = {
+    'coding': improve_coding_prompt,
+    'math': improve_math_prompt,
+    'analysis': improve_analysis_prompt,
+    'creative': improve_creative_prompt,
+    'explanation': improve_explanation_prompt,
+    'decision': improve_decision_prompt
+}
+
+
+def show_examples():
+    """Show before/after improvement examples."""
+    lines = ["BEFORE/AFTER EXAMPLES:", "=" * 60]
+    
+    for example_type, original, improved in EXAMPLES:
+        lines.append(f"\n{example_type}:")
+        lines.append(f"Before: {original}")
+        lines.append(f"After:  {improved}")
+        lines.append("-" * 60)
+    
+    # Write everything at once rather than one print per line
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def format_result(result, compare=False):
+    """Format an improvement result as CLI output text."""
+    lines = [
+        "FREE AI PROMPT IMPROVER",
+        "=" * 50,
+        f"Method: {result['method']}",
+        "",
+        "IMPROVED PROMPT:",
+        "-" * 20,
+        result['improved_prompt'],
     ]
     
-    print("BEFORE/AFTER EXAMPLES:")
-    print("=" * 60)
+    if compare:
+        original_words = len(result['original_prompt'].split())
+        improved_words = len(result['improved_prompt'].split())
+        lines.extend([
+            "",
+            "ORIGINAL PROMPT:",
+            "-" * 20,
+            result['original_prompt'],
+            "",
+            "IMPROVEMENTS:",
+            "-" * 20,
+            f"• Expanded from {original_words} to {improved_words} words",
+        ])
+        lines.extend(IMPROVEMENT_NOTES)
     
-    for example in examples:
-        print(f"\n{example['type'].upper()}:")
-        print(f"Before: {example['original']}")
-        print(f"After:  {example['improved']}")
-        print("-" * 60)
+    return "\n".join(lines) + "\n"
+
+
+def positive_int(value):
+    """Argparse type for counts that must be at least 1."""
+    import argparse
+    
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return number
+
+
+def improve_batch_file(args):
+    """Improve every non-empty line of args.batch and print the results."""
+    with open(args.batch, encoding='utf-8') as f:
+        prompts = [line.strip() for line in f if line.strip()]
+    
+    if args.manual:
+        results = [improve_prompt_manually(prompt) for prompt in prompts]
+    else:
+        results = improve_prompts_with_free_ai(
+            prompts, use_cache=not args.no_cache, batch_size=args.batch_size
+        )
+    
+    sys.stdout.write("\n".join(format_result(result, compare=args.compare) for result in results))
+
+
+def print_improvement(prompt, manual=False, use_cache=True, compare=False):
+    """Improve a single prompt and print the result."""
+    try:
+        if manual:
+            result = improve_prompt_manually(prompt)
+        else:
+            result = improve_prompt_with_free_ai(prompt, use_cache=use_cache)
+        
+        sys.stdout.write(format_result(result, compare=compare))
+        
+    except Exception as e:
+        print(f"Error: {e}")
 
 
 def main():
     """Main CLI interface."""
+    # Fast path for the common `free_ai_improver.py "prompt"` call: skip
+    # building the argument parser entirely
+    if len(sys.argv) == 2 and sys.argv[1] and not sys.argv[1].startswith('-'):
+        print_improvement(sys.argv[1])
+        return
+    
+    # No arguments: just show usage
+    if len(sys.argv) == 1:
+        sys.stdout.write(USAGE)
+        return
+    
+    import argparse
+    
     parser = argparse.ArgumentParser(description='Free AI Prompt Improver (No API Key Required)')
     parser.add_argument('prompt', nargs='?', help='Prompt to improve')
     parser.add_argument('--examples', action='store_true', help='Show before/after examples')
     parser.add_argument('--compare', action='store_true', help='Show detailed comparison')
     parser.add_argument('--manual', action='store_true', help='Skip AI and use rules only')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore cached AI results')
+    parser.add_argument('--batch', metavar='FILE', help='Improve every prompt in FILE (one per line)')
+    parser.add_argument('--batch-size', type=positive_int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Prompts generated together in --batch mode (default: {DEFAULT_BATCH_SIZE})')
     
     args = parser.parse_args()
     
+    if args.batch and args.prompt:
+        parser.error("give either a prompt or --batch FILE, not both")
+    
     # Show examples
     if args.examples:
         show_examples()
         return
     
+    # Improve a file of prompts
+    if args.batch:
+        try:
+            improve_batch_file(args)
+        except Exception as e:
+            print(f"Error: {e}")
+        return
+    
     # Check for prompt
     if not args.prompt:
-        print("FREE AI PROMPT IMPROVER")
-        print("=" * 40)
-        print("No API key required! Uses free AI models.")
-        print()
-        print("Usage: python free_ai_improver.py \"Your prompt here\"")
-        print("       python free_ai_improver.py --examples")
-        print()
-        print("📦 Install transformers for AI mode: pip install transformers torch")
+        sys.stdout.write(USAGE)
         return
     
     # Improve the prompt
-    try:
-        if args.manual:
-            result = improve_prompt_manually(args.prompt)
-        else:
-            result = improve_prompt_with_free_ai(args.prompt)
-        
-        print("FREE AI PROMPT IMPROVER")
-        print("=" * 50)
-        print(f"Method: {result['method']}")
-        print()
-        print("IMPROVED PROMPT:")
-        print("-" * 20)
-        print(result['improved_prompt'])
-        
-        if args.compare:
-            print()
-            print("ORIGINAL PROMPT:")
-            print("-" * 20)
-            print(result['original_prompt'])
-            print()
-            print("IMPROVEMENTS:")
-            print("-" * 20)
-            original_words = len(result['original_prompt'].split())
-            improved_words = len(result['improved_prompt'].split())
-            print(f"• Expanded from {original_words} to {improved_words} words")
-            print(f"• Added specific requirements and structure")
-            print(f"• Improved clarity and completeness")
-            print(f"• Enhanced with best practices")
-        
-    except Exception as e:
-        print(f"Error: {e}")
+    print_improvement(
+        args.prompt, manual=args.manual, use_cache=not args.no_cache, compare=args.compare
+    )
 
 
 if __name__ == '__main__':